@@ -70,6 +70,23 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Shared by every worker process, so the invalidation in main_dealer/signals.py
+# reaches all of them. The table is created by main_dealer migration 0016.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {
+            # Listing pages are cached per querystring
+            'MAX_ENTRIES': 5000,
+        },
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
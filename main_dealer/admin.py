@@ -1,13 +1,108 @@
 from django.contrib import admin
-from django.utils.html import format_html
+from django.db import connection
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, Upper
+from django.db.models.lookups import Exact
+from django.utils.html import conditional_escape, format_html
+from django.utils.text import smart_split, unescape_string_literal
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from .models import (
     Category, Brand, CarModel, Feature, Car, CarImage, RentalRate,
-    Customer, Inquiry, Rental, Sale, TestDrive, BlogPost
+    Customer, Inquiry, Rental, Sale, TestDrive, BlogPost, main_image_prefetches
 )
 
 
+# "Brand Model" label for admins of models with a car FK, built by the database
+# so the column costs no Python formatting per row and can be sorted on. Only the
+# car row itself is selected, for the action checkbox label (Car.__str__ reads
+# display_name), so brand and model objects are never loaded
+RELATED_CAR_INFO = Concat('car__brand__name', Value(' '), 'car__car_model__name')
+
+
+# Preview <img> markup split around the URL, so each row only escapes the URL
+# and concatenates instead of running format_html's format + escape pass
+_IMG_PREFIX = '<img src="'
+_IMG_SUFFIX = '" style="object-fit: cover;" loading="lazy" decoding="async" />'
+LOGO_PREVIEW_SUFFIX = '" width="50" height="50' + _IMG_SUFFIX
+IMAGE_PREVIEW_SUFFIX = '" width="100" height="75' + _IMG_SUFFIX
+CAR_PREVIEW_SUFFIX = '" width="80" height="60' + _IMG_SUFFIX
+
+
+def preview_img(url, suffix):
+    """Preview ``<img>`` tag for ``url`` closed by one of the suffixes above"""
+    return mark_safe(_IMG_PREFIX + conditional_escape(url) + suffix)
+
+
+def is_changelist(request):
+    """Whether ``request`` is for an admin changelist page"""
+    match = request.resolver_match
+    return match is not None and (match.url_name or '').endswith('_changelist')
+
+
+class IndexedSearchMixin:
+    """Search only with lookups the database can answer from an index.
+
+    Django's ``=`` and ``^`` search prefixes compile to ``iexact`` and
+    ``istartswith``, which wrap the column in UPPER() or LIKE and so scan the
+    table. Instead, each search term must equal one of ``exact_search_fields``
+    (columns with a plain index) or, ignoring case, one of
+    ``upper_search_fields`` (columns with an ``Upper(field)`` expression index).
+    """
+    exact_search_fields = []
+    upper_search_fields = []
+
+    def get_search_fields(self, request):
+        # The changelist only renders its search box when this is non-empty
+        return [*self.exact_search_fields, *self.upper_search_fields]
+
+    def get_search_results(self, request, queryset, search_term):
+        # Built here instead of through super(), whose icontains lookups on the
+        # search fields above would scan the table
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            term_query = Q.create([(field, bit) for field in self.exact_search_fields], connector=Q.OR)
+            for field in self.upper_search_fields:
+                term_query |= Q(Exact(Upper(field), Upper(Value(bit))))
+            queryset = queryset.filter(term_query)
+        return queryset, False
+
+
+class CarModelListFilter(admin.RelatedFieldListFilter):
+    """Car model filter whose "Brand Model" labels come from one joined query"""
+
+    def field_choices(self, field, request, model_admin):
+        car_models = CarModel.objects.select_related('brand').only('name', 'brand__name')
+        return [(car_model.pk, str(car_model)) for car_model in car_models]
+
+
+class FullTextSearchMixin:
+    """Search long text columns with PostgreSQL full-text search.
+
+    Fields in ``full_text_search_fields`` are matched through the GIN indexes
+    created in migration 0002 instead of ``icontains``. Other databases fall
+    back to Django's default search over those fields.
+    """
+    full_text_search_fields = []
+
+    def get_search_fields(self, request):
+        search_fields = list(super().get_search_fields(request))
+        if connection.vendor != 'postgresql':
+            search_fields += self.full_text_search_fields
+        return search_fields
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term and connection.vendor == 'postgresql':
+            from django.contrib.postgres.search import SearchQuery, SearchVector
+            text_matches = queryset.annotate(
+                search_document=SearchVector(*self.full_text_search_fields, config='english')
+            ).filter(search_document=SearchQuery(search_term, config='english'))
+            results = queryset.filter(Q(pk__in=results.values('pk')) | Q(pk__in=text_matches.values('pk')))
+        return results, may_have_duplicates
+
+
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'slug', 'created_at']
@@ -28,7 +123,8 @@ class BrandAdmin(admin.ModelAdmin):
 
     def logo_preview(self, obj):
         if obj.logo:
-            return format_html('<img src="{}" width="50" height="50" style="object-fit: cover;" />', obj.logo.url)
+            logo = obj.logo_thumbnail or obj.logo
+            return preview_img(logo.url, LOGO_PREVIEW_SUFFIX)
         return "No Logo"
     logo_preview.short_description = "Logo Preview"
 
@@ -58,7 +154,8 @@ class CarImageInline(admin.TabularInline):
 
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" width="100" height="75" style="object-fit: cover;" />', obj.image.url)
+            image = obj.thumbnail or obj.image
+            return preview_img(image.url, IMAGE_PREVIEW_SUFFIX)
         return "No Image"
     image_preview.short_description = "Preview"
 
@@ -70,17 +167,23 @@ class RentalRateInline(admin.TabularInline):
 
 
 @admin.register(Car)
-class CarAdmin(admin.ModelAdmin):
+class CarAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = [
         'stock_number', 'car_info', 'year', 'car_type', 'color', 
         'selling_price', 'final_price', 'status', 'is_featured', 'main_image_preview'
     ]
     list_filter = [
         'status', 'car_type', 'is_featured', 'is_for_sale', 'is_for_rent',
-        'brand', 'transmission', 'fuel_type', 'condition', 'year'
+        'brand', ('car_model', CarModelListFilter), 'transmission', 'fuel_type', 'condition', 'year'
     ]
-    search_fields = ['stock_number', 'vin_number', 'brand__name', 'car_model__name', 'color']
+    # Search covers only the car's own indexed columns; brands and models are
+    # narrowed by PK through list_filter, and the form picks them by autocomplete
+    exact_search_fields = ['stock_number', 'vin_number']
+    upper_search_fields = ['color']
+    search_help_text = "Exact stock number or VIN, or a whole color name (any case)"
+    autocomplete_fields = ['brand', 'car_model']
     prepopulated_fields = {'slug': ('title',)}
+    show_full_result_count = False
     readonly_fields = ['id', 'final_price', 'monthly_rent_estimate', 'main_image_preview', 'created_at', 'updated_at']
     
     fieldsets = (
@@ -116,23 +219,38 @@ class CarAdmin(admin.ModelAdmin):
     
     inlines = [CarImageInline, RentalRateInline]
     filter_horizontal = ['features']
+
+    def get_queryset(self, request):
+        # Load the preview images for all rows up front instead of querying per row
+        preview_images = CarImage.objects.only('car', 'image', 'thumbnail')
+        queryset = super().get_queryset(request).prefetch_related(
+            *main_image_prefetches(preview_images)
+        ).annotate(_car_info=Concat('brand__name', Value(' '), 'car_model__name'))
+        if is_changelist(request):
+            # Long text columns are only shown on the change form
+            queryset = queryset.defer('description', 'meta_description')
+        return queryset
     
     def car_info(self, obj):
-        return f"{obj.brand.name} {obj.car_model.name}"
+        return obj._car_info
     car_info.short_description = "Car"
+    car_info.admin_order_field = '_car_info'
     
     def main_image_preview(self, obj):
         main_img = obj.main_image
         if main_img:
-            return format_html('<img src="{}" width="80" height="60" style="object-fit: cover;" />', main_img.image.url)
+            image = main_img.thumbnail or main_img.image
+            return preview_img(image.url, CAR_PREVIEW_SUFFIX)
         return "No Image"
     main_image_preview.short_description = "Image"
 
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['full_name', 'email', 'phone', 'city', 'country', 'created_at']
-    search_fields = ['first_name', 'last_name', 'email', 'phone', 'id_number']
+    exact_search_fields = ['email', 'phone', 'id_number']
+    upper_search_fields = ['first_name', 'last_name']
+    search_help_text = "Exact email, phone or ID number, or a whole first or last name (any case)"
     list_filter = ['city', 'country', 'created_at']
     readonly_fields = ['full_name', 'created_at']
     
@@ -154,10 +272,13 @@ class CustomerAdmin(admin.ModelAdmin):
 
 
 @admin.register(Inquiry)
-class InquiryAdmin(admin.ModelAdmin):
+class InquiryAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['customer', 'car_info', 'inquiry_type', 'status', 'created_at', 'car_link']
     list_filter = ['inquiry_type', 'status', 'preferred_contact_method', 'created_at']
-    search_fields = ['customer__first_name', 'customer__last_name', 'car__stock_number', 'message']
+    search_fields = ['customer__first_name', 'customer__last_name', 'car__stock_number']
+    full_text_search_fields = ['message']
+    show_full_result_count = False
+    raw_id_fields = ['car', 'customer']
     readonly_fields = ['created_at', 'updated_at', 'car_link']
     
     fieldsets = (
@@ -173,13 +294,17 @@ class InquiryAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('customer', 'car').annotate(_car_info=RELATED_CAR_INFO)
+
     def car_info(self, obj):
-        return f"{obj.car.brand.name} {obj.car.car_model.name}"
+        return obj._car_info
     car_info.short_description = "Car"
+    car_info.admin_order_field = '_car_info'
     
     def car_link(self, obj):
-        if obj.car:
-            url = reverse('admin:your_app_car_change', args=[obj.car.pk])  # Replace 'your_app' with actual app name
+        if obj.car_id:
+            url = reverse('admin:main_dealer_car_change', args=[obj.car_id])
             return format_html('<a href="{}" target="_blank">View Car Details</a>', url)
         return "No Car"
     car_link.short_description = "Car Details"
@@ -190,6 +315,8 @@ class RentalAdmin(admin.ModelAdmin):
     list_display = ['id', 'customer', 'car_info', 'start_date', 'end_date', 'total_amount', 'status']
     list_filter = ['status', 'start_date', 'created_at']
     search_fields = ['customer__first_name', 'customer__last_name', 'car__stock_number']
+    show_full_result_count = False
+    raw_id_fields = ['car', 'customer']
     readonly_fields = ['id', 'created_at', 'updated_at']
     date_hierarchy = 'start_date'
     
@@ -212,9 +339,13 @@ class RentalAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('customer', 'car').annotate(_car_info=RELATED_CAR_INFO)
+
     def car_info(self, obj):
-        return f"{obj.car.brand.name} {obj.car.car_model.name}"
+        return obj._car_info
     car_info.short_description = "Car"
+    car_info.admin_order_field = '_car_info'
 
 
 @admin.register(Sale)
@@ -222,6 +353,8 @@ class SaleAdmin(admin.ModelAdmin):
     list_display = ['id', 'customer', 'car_info', 'agreed_price', 'final_amount', 'payment_method', 'status', 'sale_date']
     list_filter = ['status', 'payment_method', 'sale_date', 'created_at']
     search_fields = ['customer__first_name', 'customer__last_name', 'car__stock_number']
+    show_full_result_count = False
+    raw_id_fields = ['car', 'customer']
     readonly_fields = ['id', 'created_at', 'updated_at']
     date_hierarchy = 'sale_date'
     
@@ -244,9 +377,13 @@ class SaleAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('customer', 'car').annotate(_car_info=RELATED_CAR_INFO)
+
     def car_info(self, obj):
-        return f"{obj.car.brand.name} {obj.car.car_model.name}"
+        return obj._car_info
     car_info.short_description = "Car"
+    car_info.admin_order_field = '_car_info'
 
 
 @admin.register(TestDrive)
@@ -254,6 +391,7 @@ class TestDriveAdmin(admin.ModelAdmin):
     list_display = ['customer', 'car_info', 'scheduled_date', 'duration_minutes', 'status']
     list_filter = ['status', 'scheduled_date', 'created_at']
     search_fields = ['customer__first_name', 'customer__last_name', 'car__stock_number']
+    raw_id_fields = ['car', 'customer']
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'scheduled_date'
     
@@ -270,16 +408,21 @@ class TestDriveAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('customer', 'car').annotate(_car_info=RELATED_CAR_INFO)
+
     def car_info(self, obj):
-        return f"{obj.car.brand.name} {obj.car.car_model.name}"
+        return obj._car_info
     car_info.short_description = "Car"
+    car_info.admin_order_field = '_car_info'
 
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
+class BlogPostAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'author', 'is_published', 'published_date', 'created_at']
     list_filter = ['is_published', 'published_date', 'author', 'created_at']
-    search_fields = ['title', 'content']
+    search_fields = ['title']
+    full_text_search_fields = ['content']
     prepopulated_fields = {'slug': ('title',)}
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'published_date'
@@ -297,6 +440,13 @@ class BlogPostAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('author')
+        if is_changelist(request):
+            # Post bodies are only shown on the change form
+            queryset = queryset.defer('content', 'excerpt')
+        return queryset
+
 
 # Optional: Customize the admin site header and title
 admin.site.site_header = "Kai and Karo Car Dealership Admin"
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MainDealerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main_dealer'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db.models import Max, Min
+
+from .models import Brand, Car, CarModel, Category
+
+
+BRAND_CHOICES_CACHE_KEY = 'main_dealer:brand_choices'
+BRAND_CHOICES_TIMEOUT = 60 * 60
+
+AVAILABLE_CAR_CHOICES_CACHE_KEY = 'main_dealer:available_car_choices'
+AVAILABLE_CAR_CHOICES_TIMEOUT = 60 * 5
+
+FILTER_OPTIONS_CACHE_KEY = 'main_dealer:car_filter_options'
+FILTER_OPTIONS_TIMEOUT = 60 * 10
+
+MODELS_BY_BRAND_CACHE_KEY = 'main_dealer:models_by_brand'
+MODELS_BY_BRAND_TIMEOUT = 60 * 60
+
+CAR_LIST_VERSION_CACHE_KEY = 'main_dealer:car_list_version'
+CAR_LIST_PAGE_TIMEOUT = 60
+
+
+def get_cached_brand_choices():
+    """Return ``(id, name)`` pairs for active brands, cached until a brand changes"""
+    return cache.get_or_set(
+        BRAND_CHOICES_CACHE_KEY,
+        lambda: list(Brand.objects.filter(is_active=True).order_by('name').values_list('id', 'name')),
+        BRAND_CHOICES_TIMEOUT,
+    )
+
+
+def get_cached_available_car_choices():
+    """Return ``(id, label)`` pairs for available cars, cached for five minutes"""
+    return cache.get_or_set(
+        AVAILABLE_CAR_CHOICES_CACHE_KEY,
+        lambda: list(Car.objects.filter(status='available').values_list('id', 'display_name')),
+        AVAILABLE_CAR_CHOICES_TIMEOUT,
+    )
+
+
+def get_filter_options():
+    """Return the car listing's filter options, cached until the inventory changes.
+
+    Brands, models and categories are stored as plain dicts so the cached
+    value stays small; the listing template only reads their fields.
+    """
+    def build_options():
+        ranges = Car.objects.aggregate(
+            min_price=Min('selling_price'),
+            max_price=Max('selling_price'),
+            min_year=Min('year'),
+            max_year=Max('year'),
+        )
+        return {
+            'brands': list(Brand.objects.filter(is_active=True).order_by('name').values('id', 'name')),
+            'models': list(
+                CarModel.objects.filter(is_active=True)
+                .order_by('brand__name', 'name')
+                .values('id', 'brand_id', 'name')
+            ),
+            'categories': list(Category.objects.order_by('name').values('id', 'name', 'slug')),
+            # Streamed in chunks (a server-side cursor on PostgreSQL) rather than buffered whole
+            'years': tuple(Car.objects.values_list('year', flat=True).distinct().order_by('-year').iterator(chunk_size=500)),
+            'colors': tuple(Car.objects.values_list('color', flat=True).distinct().order_by('color').iterator(chunk_size=500)),
+            'price_range': {'min_price': ranges['min_price'], 'max_price': ranges['max_price']},
+            'year_range': {'min_year': ranges['min_year'], 'max_year': ranges['max_year']},
+        }
+
+    return cache.get_or_set(FILTER_OPTIONS_CACHE_KEY, build_options, FILTER_OPTIONS_TIMEOUT)
+
+
+def get_car_list_version():
+    """Return the current version of the cached car listing pages"""
+    return cache.get_or_set(CAR_LIST_VERSION_CACHE_KEY, time.time_ns, None)
+
+
+def bump_car_list_version():
+    """Orphan every cached car listing page by moving to a new version"""
+    cache.set(CAR_LIST_VERSION_CACHE_KEY, time.time_ns(), None)
+
+
+def _json_payload(data):
+    """Return ``(etag, body)`` for ``data`` serialized as compact JSON"""
+    body = json.dumps(data, separators=(',', ':'))
+    return hashlib.md5(body.encode(), usedforsecurity=False).hexdigest(), body
+
+
+EMPTY_MODELS_PAYLOAD = _json_payload({'models': []})
+
+
+def get_cached_models_by_brand():
+    """Return ``{brand_id: (etag, body)}`` for the models-by-brand endpoint.
+
+    Keys are brand ids as strings, as they arrive in the query string. Bodies
+    are serialized once here and cached until a car model changes.
+    """
+    def build_payloads():
+        models_by_brand = {}
+        models = CarModel.objects.filter(is_active=True).order_by('name').values_list('id', 'brand_id', 'name')
+        for pk, brand_id, name in models:
+            models_by_brand.setdefault(str(brand_id), []).append({'id': pk, 'name': name})
+        return {
+            brand_id: _json_payload({'models': brand_models})
+            for brand_id, brand_models in models_by_brand.items()
+        }
+
+    return cache.get_or_set(MODELS_BY_BRAND_CACHE_KEY, build_payloads, MODELS_BY_BRAND_TIMEOUT)
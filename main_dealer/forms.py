@@ -1,6 +1,50 @@
+import re
+
 from django import forms
+from django.db import transaction
 from django.core.validators import RegexValidator
-from .models import Inquiry, TestDrive, Customer, Car
+from .models import Inquiry, TestDrive, Customer, Car, Brand
+from .caching import get_cached_available_car_choices, get_cached_brand_choices
+
+
+PHONE_RE = re.compile(r'^\+?1?\d{9,15}$')
+PHONE_VALIDATOR = RegexValidator(
+    regex=PHONE_RE,
+    message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
+)
+
+# Search filter choices, each with an "any" option first
+CAR_TYPE_CHOICES = (('', 'Any Type'),) + tuple(Car.CAR_TYPES)
+TRANSMISSION_FILTER_CHOICES = (('', 'Any Transmission'),) + tuple(Car.TRANSMISSION_CHOICES)
+FUEL_TYPE_FILTER_CHOICES = (('', 'Any Fuel Type'),) + tuple(Car.FUEL_TYPES)
+
+
+class ConsentCheckboxInput(forms.CheckboxInput):
+    """Checkbox rendered without the HTML5 required attribute; consent is only validated server-side"""
+
+    def use_required_attribute(self, initial):
+        return False
+
+
+def _get_or_create_customer(cleaned_data, **defaults):
+    """Return the customer with the submitted email, creating one if needed.
+
+    Returning customers cost a single lookup on the unique email index; the
+    savepoint-wrapped INSERT only runs for new customers.
+    """
+    email = cleaned_data['email']
+    customer = Customer.objects.filter(email=email).only('id', 'driving_license_number').first()
+    if customer is None:
+        customer, created = Customer.objects.get_or_create(
+            email=email,
+            defaults={
+                'first_name': cleaned_data['first_name'],
+                'last_name': cleaned_data['last_name'],
+                'phone': cleaned_data['phone'],
+                **defaults,
+            }
+        )
+    return customer
 
 
 class InquiryForm(forms.ModelForm):
@@ -30,12 +74,8 @@ class InquiryForm(forms.ModelForm):
         })
     )
     
-    phone_regex = RegexValidator(
-        regex=r'^\+?1?\d{9,15}$',
-        message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
-    )
     phone = forms.CharField(
-        validators=[phone_regex],
+        validators=[PHONE_VALIDATOR],
         max_length=17,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
@@ -68,15 +108,6 @@ class InquiryForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         self.car = kwargs.pop('car', None)
         super().__init__(*args, **kwargs)
-        
-        # Add Bootstrap classes and styling
-        for field_name, field in self.fields.items():
-            if field_name not in ['inquiry_type', 'preferred_contact_method']:
-                field.widget.attrs.update({'class': 'form-control'})
-            
-            # Add required attribute for HTML5 validation
-            if field.required:
-                field.widget.attrs.update({'required': 'required'})
 
     def save(self, commit=True):
         inquiry = super().save(commit=False)
@@ -85,17 +116,10 @@ class InquiryForm(forms.ModelForm):
             inquiry.car = self.car
             
         if commit:
-            # Create or get customer
-            customer, created = Customer.objects.get_or_create(
-                email=self.cleaned_data['email'],
-                defaults={
-                    'first_name': self.cleaned_data['first_name'],
-                    'last_name': self.cleaned_data['last_name'],
-                    'phone': self.cleaned_data['phone'],
-                }
-            )
-            inquiry.customer = customer
-            inquiry.save()
+            # Customer and inquiry rows are written under a single commit
+            with transaction.atomic():
+                inquiry.customer = _get_or_create_customer(self.cleaned_data)
+                inquiry.save()
             
         return inquiry
 
@@ -127,12 +151,8 @@ class TestDriveForm(forms.ModelForm):
         })
     )
     
-    phone_regex = RegexValidator(
-        regex=r'^\+?1?\d{9,15}$',
-        message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
-    )
     phone = forms.CharField(
-        validators=[phone_regex],
+        validators=[PHONE_VALIDATOR],
         max_length=17,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
@@ -182,11 +202,6 @@ class TestDriveForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         self.car = kwargs.pop('car', None)
         super().__init__(*args, **kwargs)
-        
-        # Add Bootstrap validation classes
-        for field_name, field in self.fields.items():
-            if field.required:
-                field.widget.attrs.update({'required': 'required'})
 
     def save(self, commit=True):
         test_drive = super().save(commit=False)
@@ -195,24 +210,20 @@ class TestDriveForm(forms.ModelForm):
             test_drive.car = self.car
             
         if commit:
-            # Create or get customer
-            customer, created = Customer.objects.get_or_create(
-                email=self.cleaned_data['email'],
-                defaults={
-                    'first_name': self.cleaned_data['first_name'],
-                    'last_name': self.cleaned_data['last_name'],
-                    'phone': self.cleaned_data['phone'],
-                    'driving_license_number': self.cleaned_data['driving_license_number'],
-                }
-            )
-            
-            # Update driving license if customer exists but doesn't have it
-            if not customer.driving_license_number:
-                customer.driving_license_number = self.cleaned_data['driving_license_number']
-                customer.save()
+            # Customer and test drive rows are written under a single commit
+            with transaction.atomic():
+                customer = _get_or_create_customer(
+                    self.cleaned_data,
+                    driving_license_number=self.cleaned_data['driving_license_number'],
+                )
                 
-            test_drive.customer = customer
-            test_drive.save()
+                # Update driving license if customer exists but doesn't have it
+                if not customer.driving_license_number:
+                    customer.driving_license_number = self.cleaned_data['driving_license_number']
+                    customer.save(update_fields=['driving_license_number'])
+                    
+                test_drive.customer = customer
+                test_drive.save()
             
         return test_drive
 
@@ -294,7 +305,7 @@ class ContactForm(forms.Form):
     # Consent checkbox
     consent = forms.BooleanField(
         required=True,
-        widget=forms.CheckboxInput(attrs={
+        widget=ConsentCheckboxInput(attrs={
             'class': 'form-check-input'
         }),
         label='I agree to be contacted regarding my inquiry'
@@ -303,17 +314,15 @@ class ContactForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # Add Bootstrap validation
-        for field_name, field in self.fields.items():
-            if field.required and field_name != 'consent':
-                field.widget.attrs.update({'required': 'required'})
+        # Render car options from the cache; the queryset is only used to validate a submitted car
+        car_field = self.fields['interested_car']
+        car_field.choices = [('', car_field.empty_label)] + get_cached_available_car_choices()
 
     def clean_phone(self):
         phone = self.cleaned_data.get('phone')
         if phone:
             # Basic phone validation
-            import re
-            if not re.match(r'^\+?1?\d{9,15}$', phone):
+            if not PHONE_RE.match(phone):
                 raise forms.ValidationError("Please enter a valid phone number.")
         return phone
 
@@ -322,7 +331,7 @@ class CarSearchForm(forms.Form):
     """Form for searching/filtering cars"""
     
     brand = forms.ModelChoiceField(
-        queryset=None,  # Will be set in __init__
+        queryset=Brand.objects.filter(is_active=True),
         required=False,
         empty_label="Any Brand",
         widget=forms.Select(attrs={
@@ -331,7 +340,7 @@ class CarSearchForm(forms.Form):
     )
     
     car_type = forms.ChoiceField(
-        choices=[('', 'Any Type')] + Car.CAR_TYPES,
+        choices=CAR_TYPE_CHOICES,
         required=False,
         widget=forms.Select(attrs={
             'class': 'form-select'
@@ -377,7 +386,7 @@ class CarSearchForm(forms.Form):
     )
     
     transmission = forms.ChoiceField(
-        choices=[('', 'Any Transmission')] + Car.TRANSMISSION_CHOICES,
+        choices=TRANSMISSION_FILTER_CHOICES,
         required=False,
         widget=forms.Select(attrs={
             'class': 'form-select'
@@ -385,7 +394,7 @@ class CarSearchForm(forms.Form):
     )
     
     fuel_type = forms.ChoiceField(
-        choices=[('', 'Any Fuel Type')] + Car.FUEL_TYPES,
+        choices=FUEL_TYPE_FILTER_CHOICES,
         required=False,
         widget=forms.Select(attrs={
             'class': 'form-select'
@@ -403,9 +412,9 @@ class CarSearchForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # Set brand queryset
-        from .models import Brand
-        self.fields['brand'].queryset = Brand.objects.filter(is_active=True).order_by('name')
+        # Render brand options from the cache; the queryset is only used to validate a submitted brand
+        brand_field = self.fields['brand']
+        brand_field.choices = [('', brand_field.empty_label)] + get_cached_brand_choices()
 
 
 class NewsletterForm(forms.Form):
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from PIL import UnidentifiedImageError
+
+from main_dealer.models import Brand, CarImage
+from main_dealer.thumbnails import make_thumbnail
+
+
+class Command(BaseCommand):
+    help = "Generate missing resized copies of brand logos and car images"
+
+    def handle(self, *args, **options):
+        logos = Brand.objects.exclude(logo='').filter(Q(logo_thumbnail='') | Q(logo_thumbnail__isnull=True))
+        logo_count = skipped = 0
+        for brand in logos.iterator():
+            try:
+                brand.logo_thumbnail = make_thumbnail(brand.logo, Brand.LOGO_THUMBNAIL_SIZE)
+            except (OSError, UnidentifiedImageError) as exc:
+                self.stderr.write(f"Skipped logo of brand {brand.pk} ({brand.logo.name}): {exc}")
+                skipped += 1
+                continue
+            brand.save(update_fields=['logo_thumbnail'])
+            logo_count += 1
+
+        images = CarImage.objects.exclude(image='').filter(Q(thumbnail='') | Q(card=''))
+        image_count = 0
+        for image in images.iterator():
+            try:
+                if not image.thumbnail:
+                    image.thumbnail = make_thumbnail(image.image, CarImage.THUMBNAIL_SIZE)
+                if not image.card:
+                    image.card = make_thumbnail(image.image, CarImage.CARD_SIZE)
+            except (OSError, UnidentifiedImageError) as exc:
+                self.stderr.write(f"Skipped car image {image.pk} ({image.image.name}): {exc}")
+                skipped += 1
+                continue
+            image.save(update_fields=['thumbnail', 'card'])
+            image_count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated variants for {logo_count} brand logos and {image_count} car images"
+            f" ({skipped} unreadable files skipped)"
+        ))
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+# (index name, table, column) for the admin's full-text search fields. The
+# expression must match the SearchVector built in FullTextSearchMixin.
+SEARCH_INDEXES = [
+    ('main_dealer_inquiry_message_fts', 'main_dealer_inquiry', 'message'),
+    ('main_dealer_blogpost_content_fts', 'main_dealer_blogpost', 'content'),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in SEARCH_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin (to_tsvector('english'::regconfig, COALESCE(({column})::text, '')))"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in SEARCH_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
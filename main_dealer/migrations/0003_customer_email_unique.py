@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_customers(apps, schema_editor):
+    """Fold customers sharing an email into the oldest one before adding the constraint"""
+    Customer = apps.get_model('main_dealer', 'Customer')
+    related_models = [apps.get_model('main_dealer', name) for name in ('Inquiry', 'Rental', 'Sale', 'TestDrive')]
+    duplicated = Customer.objects.values('email').annotate(n=Count('pk')).filter(n__gt=1).values_list('email', flat=True)
+    for email in duplicated:
+        kept, *duplicates = Customer.objects.filter(email=email).order_by('pk')
+        duplicate_ids = [customer.pk for customer in duplicates]
+        for model in related_models:
+            model.objects.filter(customer_id__in=duplicate_ids).update(customer=kept)
+        if kept.user_id is None:
+            kept.user_id = next((customer.user_id for customer in duplicates if customer.user_id), None)
+        if not kept.driving_license_number:
+            kept.driving_license_number = next(
+                (customer.driving_license_number for customer in duplicates if customer.driving_license_number), ''
+            )
+        Customer.objects.filter(pk__in=duplicate_ids).delete()
+        kept.save(update_fields=['user', 'driving_license_number'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_customers, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='customer',
+            name='email',
+            field=models.EmailField(max_length=254, unique=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0003_customer_email_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='brand',
+            name='logo_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='brand_logos/thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='carimage',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, upload_to='car_images/thumbnails/'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0004_image_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['is_featured', 'status'], name='main_dealer_is_feat_7a81d2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['start_date'], name='main_dealer_start_d_f01ec8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['sale_date'], name='main_dealer_sale_da_d79f40_idx'),
+        ),
+    ]
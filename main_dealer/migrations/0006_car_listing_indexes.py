@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0005_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='car',
+            name='main_dealer_status_3c5dac_idx',
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['status', 'is_for_sale', '-created_at'], name='main_dealer_status_dee19d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['status', 'is_for_rent', '-created_at'], name='main_dealer_status_6676e8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['status', 'brand', 'car_model'], name='main_dealer_status_c9a36f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['status', 'selling_price'], name='main_dealer_status_7acd0d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['status', 'year'], name='main_dealer_status_355104_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['status', '-created_at'], name='main_dealer_car_featured_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+# (index name, table, column) for the car listing's full-text search. The
+# expression must match the SearchVectors built in render_car_list, which wrap
+# char and text columns in COALESCE without casting them, or PostgreSQL will
+# not use the index.
+SEARCH_INDEXES = [
+    ('main_dealer_car_title_fts', 'main_dealer_car', 'title'),
+    ('main_dealer_car_description_fts', 'main_dealer_car', 'description'),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in SEARCH_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin (to_tsvector('english'::regconfig, COALESCE({column}, '')))"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in SEARCH_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0006_car_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:10
+
+from django.db import migrations, models
+
+
+def backfill_display_names(apps, schema_editor):
+    Car = apps.get_model('main_dealer', 'Car')
+    cars = list(Car.objects.select_related('brand', 'car_model'))
+    for car in cars:
+        car.display_name = f"{car.year} {car.brand.name} {car.car_model.name}"
+    Car.objects.bulk_update(cars, ['display_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0007_car_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='car',
+            name='display_name',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_display_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:12
+
+from django.db import migrations, models
+
+
+def demote_extra_main_images(apps, schema_editor):
+    """Keep only the first main image of each car before adding the constraint"""
+    CarImage = apps.get_model('main_dealer', 'CarImage')
+    seen_cars = set()
+    extra_ids = []
+    for pk, car_id in CarImage.objects.filter(is_main=True).order_by('car', 'order', 'created_at').values_list('pk', 'car_id'):
+        if car_id in seen_cars:
+            extra_ids.append(pk)
+        seen_cars.add(car_id)
+    CarImage.objects.filter(pk__in=extra_ids).update(is_main=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0008_car_display_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_extra_main_images, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='carimage',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_main', True)), fields=('car',), name='one_main_image_per_car'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0009_one_main_image_per_car'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carimage',
+            name='card',
+            field=models.ImageField(blank=True, editable=False, upload_to='car_images/cards/'),
+        ),
+    ]
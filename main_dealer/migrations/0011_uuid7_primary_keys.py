@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:14
+
+import main_dealer.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0010_car_image_cards'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='car',
+            name='id',
+            field=models.UUIDField(default=main_dealer.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='rental',
+            name='id',
+            field=models.UUIDField(default=main_dealer.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='sale',
+            name='id',
+            field=models.UUIDField(default=main_dealer.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0011_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['status', 'brand', '-created_at'], name='main_dealer_status_7d911f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['status', 'car_model', '-created_at'], name='main_dealer_status_5223dd_idx'),
+        ),
+    ]
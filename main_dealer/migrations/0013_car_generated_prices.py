@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:15
+
+import django.db.models.expressions
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0012_related_car_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='car',
+            name='final_price',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('selling_price'), '-', models.F('dealer_discount')), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.AddField(
+            model_name='car',
+            name='monthly_rent_estimate',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(is_for_rent=True, then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('selling_price'), '-', models.F('dealer_discount')), '*', models.Value(Decimal('0.03')))), default=None), output_field=models.DecimalField(decimal_places=2, max_digits=12, null=True)),
+        ),
+    ]
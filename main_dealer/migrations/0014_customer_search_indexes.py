@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:25
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0013_car_generated_prices'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['phone'], name='main_dealer_phone_a0c8cf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['id_number'], name='main_dealer_id_numb_4fc1e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(django.db.models.functions.text.Upper('first_name'), name='main_dealer_customer_fname_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(django.db.models.functions.text.Upper('last_name'), name='main_dealer_customer_lname_idx'),
+        ),
+    ]
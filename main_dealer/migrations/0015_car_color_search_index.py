@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:28
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_dealer', '0014_customer_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(django.db.models.functions.text.Upper('color'), name='main_dealer_car_color_idx'),
+        ),
+    ]
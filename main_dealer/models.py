@@ -1,10 +1,30 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Upper
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.urls import reverse
+from django.utils.functional import cached_property
+from decimal import Decimal
+from itertools import groupby
+import os
+import time
 import uuid
 
+from .thumbnails import make_upload_thumbnail
+
+
+def uuid7():
+    """Return a time-ordered version 7 UUID (RFC 9562).
+
+    The leading 48 bits are the Unix time in milliseconds, so new primary keys
+    land at the end of the index instead of on a random page.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
 
 class Category(models.Model):
     """Car categories like Hatchback, Sedan, SUV, etc."""
@@ -26,17 +46,29 @@ class Brand(models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=50, unique=True)
     logo = models.ImageField(upload_to='brand_logos/', blank=True, null=True)
+    logo_thumbnail = models.ImageField(upload_to='brand_logos/thumbnails/', blank=True, null=True, editable=False)
     country_of_origin = models.CharField(max_length=50, blank=True)
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    LOGO_THUMBNAIL_SIZE = (100, 100)
+
     class Meta:
         ordering = ['name']
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Keep a small copy of a newly uploaded logo for admin listings; logos
+        # saved before thumbnails existed are filled in by generate_image_variants
+        if not self.logo:
+            self.logo_thumbnail = None
+        elif not self.logo._committed:
+            self.logo_thumbnail = make_upload_thumbnail(self.logo, self.LOGO_THUMBNAIL_SIZE)
+        super().save(*args, **kwargs)
+
 
 class CarModel(models.Model):
     """Car models like Camry, Q8, etc."""
@@ -115,7 +147,7 @@ class Car(models.Model):
     ]
 
     # Basic Information
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     stock_number = models.CharField(max_length=20, unique=True)
     vin_number = models.CharField(max_length=17, unique=True, blank=True, null=True)
     brand = models.ForeignKey(Brand, on_delete=models.CASCADE)
@@ -140,6 +172,21 @@ class Car(models.Model):
     msrp_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     selling_price = models.DecimalField(max_digits=12, decimal_places=2)
     dealer_discount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Computed and stored by the database whenever the row is written
+    final_price = models.GeneratedField(
+        expression=models.F('selling_price') - models.F('dealer_discount'),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
+    monthly_rent_estimate = models.GeneratedField(
+        expression=models.Case(
+            # 3% of car value per month
+            models.When(is_for_rent=True, then=(models.F('selling_price') - models.F('dealer_discount')) * Decimal('0.03')),
+            default=None,
+        ),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2, null=True),
+        db_persist=True,
+    )
     
     # Availability
     status = models.CharField(max_length=20, choices=AVAILABILITY_STATUS, default='available')
@@ -149,6 +196,8 @@ class Car(models.Model):
     
     # SEO and Content
     title = models.CharField(max_length=200, blank=True)
+    # "{year} {brand} {model}", kept in sync by save() and the Brand/CarModel signals
+    display_name = models.CharField(max_length=200, blank=True, editable=False)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     description = models.TextField(blank=True)
     meta_description = models.CharField(max_length=160, blank=True)
@@ -169,35 +218,61 @@ class Car(models.Model):
             models.Index(fields=['brand', 'car_model']),
             models.Index(fields=['year', 'car_type']),
             models.Index(fields=['selling_price']),
-            models.Index(fields=['status']),
+            models.Index(fields=['is_featured', 'status']),
+            # Listing filters always include status, so it leads each composite
+            models.Index(fields=['status', 'is_for_sale', '-created_at']),
+            models.Index(fields=['status', 'is_for_rent', '-created_at']),
+            models.Index(fields=['status', 'brand', 'car_model']),
+            models.Index(fields=['status', 'selling_price']),
+            models.Index(fields=['status', 'year']),
+            # Related cars on the detail page: newest available cars per brand / model
+            models.Index(fields=['status', 'brand', '-created_at']),
+            models.Index(fields=['status', 'car_model', '-created_at']),
+            models.Index(
+                fields=['status', '-created_at'],
+                condition=models.Q(is_featured=True),
+                name='main_dealer_car_featured_idx',
+            ),
+            # Case-insensitive color search in CarAdmin
+            models.Index(Upper('color'), name='main_dealer_car_color_idx'),
         ]
 
     def __str__(self):
-        return f"{self.year} {self.brand.name} {self.car_model.name}"
+        return self.display_name or self.build_display_name()
     
     def get_absolute_url(self):
         return reverse('car_detail', kwargs={'slug': self.slug})
     
-    @property
-    def final_price(self):
-        """Calculate final price after dealer discount"""
-        return self.selling_price - self.dealer_discount
-    
-    @property
-    def monthly_rent_estimate(self):
-        """Estimate monthly rental price (rough calculation)"""
-        if self.is_for_rent:
-            return round(self.final_price * 0.03, 2)  # 3% of car value per month
-        return None
+    def build_display_name(self):
+        return f"{self.year} {self.brand.name} {self.car_model.name}"
     
     @property
     def main_image(self):
         """Get the main image for the car"""
+        # Answer from prefetched images when available instead of querying per car
+        main_images = getattr(self, '_main_images', None)
+        if main_images:
+            return main_images[0]
+        if main_images is not None and hasattr(self, '_first_images'):
+            return self._first_images[0] if self._first_images else None
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('images')
+        if prefetched is not None:
+            images = list(prefetched)
+            return next((image for image in images if image.is_main), images[0] if images else None)
         first_image = self.images.filter(is_main=True).first()
         if first_image:
             return first_image
         return self.images.first()
     
+    @cached_property
+    def features_by_category(self):
+        """Features grouped by category, in ``Feature.Meta.ordering`` order"""
+        # features.all() is already ordered by category, so groupby needs no sort
+        return {
+            category: list(features)
+            for category, features in groupby(self.features.all(), key=lambda feature: feature.category)
+        }
+    
     @property
     def is_new(self):
         return self.car_type == 'new'
@@ -211,34 +286,88 @@ class Car(models.Model):
         return self.car_type == 'local'
 
     def save(self, *args, **kwargs):
+        self.display_name = self.build_display_name()
         if not self.title:
-            self.title = f"{self.year} {self.brand.name} {self.car_model.name}"
+            self.title = self.display_name
         if not self.slug:
             from django.utils.text import slugify
             self.slug = slugify(f"{self.title}-{self.stock_number}")
         super().save(*args, **kwargs)
+        # The database just recomputed the generated prices; reload them on next access
+        for field in ('final_price', 'monthly_rent_estimate'):
+            self.__dict__.pop(field, None)
 
 
 class CarImage(models.Model):
     """Car images"""
     car = models.ForeignKey(Car, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='car_images/')
+    thumbnail = models.ImageField(upload_to='car_images/thumbnails/', blank=True, editable=False)
+    card = models.ImageField(upload_to='car_images/cards/', blank=True, editable=False)
     alt_text = models.CharField(max_length=100, blank=True)
     is_main = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    THUMBNAIL_SIZE = (200, 150)
+    CARD_SIZE = (800, 600)
+
     class Meta:
         ordering = ['order', 'created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['car'],
+                condition=models.Q(is_main=True),
+                name='one_main_image_per_car',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.car} - Image {self.order}"
     
+    @property
+    def card_url(self):
+        """URL of the listing-sized copy, or of the original until it exists"""
+        return (self.card or self.image).url
+    
+    def validate_constraints(self, exclude=None):
+        # Promoting an image to main is allowed: save() demotes the previous one
+        exclude = set(exclude or ())
+        exclude.add('is_main')
+        super().validate_constraints(exclude=exclude)
+    
     def save(self, *args, **kwargs):
-        if self.is_main:
-            # Ensure only one main image per car
-            CarImage.objects.filter(car=self.car, is_main=True).update(is_main=False)
-        super().save(*args, **kwargs)
+        # Keep resized copies of a new upload for admin listings and the public
+        # car cards, so pages never send the full-size file; older images are
+        # filled in by generate_image_variants
+        if self.image and not self.image._committed:
+            self.thumbnail = make_upload_thumbnail(self.image, self.THUMBNAIL_SIZE)
+            self.card = make_upload_thumbnail(self.image, self.CARD_SIZE)
+        if not self.is_main:
+            return super().save(*args, **kwargs)
+        # The database allows one main image per car, so the current one is only
+        # demoted when this save actually collides with it
+        try:
+            with transaction.atomic():
+                return super().save(*args, **kwargs)
+        except IntegrityError:
+            pass
+        with transaction.atomic():
+            CarImage.objects.filter(car_id=self.car_id, is_main=True).exclude(pk=self.pk).update(is_main=False)
+            super().save(*args, **kwargs)
+
+
+def main_image_prefetches(images=None):
+    """Prefetches that let ``Car.main_image`` answer without a query per car.
+
+    ``images`` is the base CarImage queryset, e.g. to restrict the loaded columns.
+    """
+    if images is None:
+        images = CarImage.objects.all()
+    return [
+        models.Prefetch('images', queryset=images.filter(is_main=True), to_attr='_main_images'),
+        models.Prefetch('images', queryset=images[:1], to_attr='_first_images'),
+    ]
 
 
 class RentalRate(models.Model):
@@ -268,7 +397,7 @@ class Customer(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True)
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
-    email = models.EmailField()
+    email = models.EmailField(unique=True)
     phone = models.CharField(max_length=20)
     address = models.TextField(blank=True)
     city = models.CharField(max_length=50, blank=True)
@@ -278,6 +407,15 @@ class Customer(models.Model):
     id_number = models.CharField(max_length=20, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Backing the admin's customer search (CustomerAdmin.*_search_fields)
+        indexes = [
+            models.Index(fields=['phone']),
+            models.Index(fields=['id_number']),
+            models.Index(Upper('first_name'), name='main_dealer_customer_fname_idx'),
+            models.Index(Upper('last_name'), name='main_dealer_customer_lname_idx'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
     
@@ -333,7 +471,7 @@ class Rental(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     car = models.ForeignKey(Car, on_delete=models.CASCADE, related_name='rentals')
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
     start_date = models.DateTimeField()
@@ -358,6 +496,9 @@ class Rental(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['start_date']),
+        ]
 
     def __str__(self):
         return f"Rental #{self.id} - {self.car} - {self.customer.full_name}"
@@ -381,7 +522,7 @@ class Sale(models.Model):
         ('mixed', 'Mixed Payment'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     car = models.OneToOneField(Car, on_delete=models.CASCADE, related_name='sale')
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
     
@@ -405,6 +546,9 @@ class Sale(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['sale_date']),
+        ]
 
     def __str__(self):
         return f"Sale #{self.id} - {self.car} - {self.customer.full_name}"
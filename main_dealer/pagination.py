@@ -0,0 +1,19 @@
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+class CappedPaginator(Paginator):
+    """Paginator that stops counting rows after ``max_count``.
+
+    A full COUNT(*) over a broad listing filter is the slowest query on the
+    page. Counting a LIMITed subquery bounds that work, at the cost of only
+    paging through the first ``max_count`` results.
+    """
+    max_count = 1000
+    count_is_capped = False
+
+    @cached_property
+    def count(self):
+        count = self.object_list.order_by().values('pk')[:self.max_count + 1].count()
+        self.count_is_capped = count > self.max_count
+        return min(count, self.max_count)
@@ -0,0 +1,78 @@
+from django.core.cache import cache
+from django.db.models import CharField, F, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import (
+    AVAILABLE_CAR_CHOICES_CACHE_KEY, BRAND_CHOICES_CACHE_KEY, FILTER_OPTIONS_CACHE_KEY, MODELS_BY_BRAND_CACHE_KEY,
+    bump_car_list_version,
+)
+from .models import Brand, Car, CarImage, CarModel, Category
+
+
+def refresh_display_names(cars):
+    """Rebuild ``Car.display_name`` for ``cars`` in a single UPDATE of the rows whose name changed"""
+    display_name = Concat(
+        Cast('year', CharField()),
+        Value(' '),
+        Subquery(Brand.objects.filter(pk=OuterRef('brand_id')).values('name')[:1]),
+        Value(' '),
+        Subquery(CarModel.objects.filter(pk=OuterRef('car_model_id')).values('name')[:1]),
+        output_field=CharField(),
+    )
+    cars.alias(new_display_name=display_name).exclude(display_name=F('new_display_name')).update(
+        display_name=display_name
+    )
+
+
+def may_rename(created, update_fields):
+    """Whether a Brand/CarModel save can have changed the name its cars show"""
+    return not created and (update_fields is None or 'name' in update_fields)
+
+
+@receiver(post_save, sender=Brand)
+def update_brand_display_names(sender, instance, created, update_fields, **kwargs):
+    """Renaming a brand renames its cars"""
+    if may_rename(created, update_fields):
+        refresh_display_names(Car.objects.filter(brand=instance))
+
+
+@receiver(post_save, sender=CarModel)
+def update_car_model_display_names(sender, instance, created, update_fields, **kwargs):
+    """Renaming a model renames its cars"""
+    if may_rename(created, update_fields):
+        refresh_display_names(Car.objects.filter(car_model=instance))
+
+
+@receiver([post_save, post_delete], sender=Brand)
+def invalidate_brand_caches(sender, **kwargs):
+    """Drop cached brand data whenever a brand is added, edited or removed"""
+    cache.delete_many([BRAND_CHOICES_CACHE_KEY, AVAILABLE_CAR_CHOICES_CACHE_KEY, FILTER_OPTIONS_CACHE_KEY])
+    bump_car_list_version()
+
+
+@receiver([post_save, post_delete], sender=CarModel)
+def invalidate_car_model_caches(sender, **kwargs):
+    """Car labels and filter options include the model name, so renaming a model invalidates them"""
+    cache.delete_many([AVAILABLE_CAR_CHOICES_CACHE_KEY, FILTER_OPTIONS_CACHE_KEY, MODELS_BY_BRAND_CACHE_KEY])
+    bump_car_list_version()
+
+
+@receiver([post_save, post_delete], sender=Car)
+def invalidate_car_caches(sender, **kwargs):
+    """Drop cached car data whenever a car is added, edited or removed"""
+    cache.delete_many([AVAILABLE_CAR_CHOICES_CACHE_KEY, FILTER_OPTIONS_CACHE_KEY])
+    bump_car_list_version()
+
+
+@receiver([post_save, post_delete], sender=CarImage)
+def invalidate_car_image_caches(sender, **kwargs):
+    """Listing pages show car photos"""
+    bump_car_list_version()
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_caches(sender, **kwargs):
+    """Categories are listed in the car filter options"""
+    cache.delete(FILTER_OPTIONS_CACHE_KEY)
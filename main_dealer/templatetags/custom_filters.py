@@ -1,21 +1,28 @@
 # yourapp/templatetags/custom_filters.py
+from functools import lru_cache
+
 from django import template
 
 register = template.Library()
 
+# The results below are immutable, so repeated renders can share them
+
 @register.filter
+@lru_cache(maxsize=128)
 def split(value, arg):
     """Split a string by the given argument"""
-    return value.split(arg)
+    return tuple(value.split(arg))
 
 @register.filter
+@lru_cache(maxsize=256)
 def range_filter(value):
     """Create a range from 0 to value"""
     return range(int(value))
 
 @register.filter
+@lru_cache(maxsize=128)
 def year_range(start, end=None):
     """Create a range of years"""
     if end is None:
         end = start + 10
-    return range(int(start), int(end) + 1)
\ No newline at end of file
+    return range(int(start), int(end) + 1)
@@ -1,3 +1,318 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Prefetch
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-# Create your tests here.
+from .caching import (
+    get_cached_available_car_choices, get_cached_brand_choices, get_cached_models_by_brand, get_car_list_version,
+    get_filter_options,
+)
+from .models import (
+    Brand, Car, CarImage, CarModel, Customer, Inquiry, Rental, Sale, TestDrive, main_image_prefetches,
+)
+from .pagination import CappedPaginator
+
+
+def create_car(stock_number='KK001'):
+    brand, _ = Brand.objects.get_or_create(name='Toyota', slug='toyota')
+    car_model, _ = CarModel.objects.get_or_create(brand=brand, name='Prado', slug='prado')
+    return Car.objects.create(
+        stock_number=stock_number, brand=brand, car_model=car_model, year=2020, car_type='foreign',
+        color='Black', mileage=10000, engine_size=2.8, horsepower=200, transmission='automatic',
+        fuel_type='diesel', condition='good', selling_price=5000000,
+    )
+
+
+class CarImageMainImageTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.car = create_car()
+
+    def add_image(self, **kwargs):
+        # An already stored file name, so saving generates no variants
+        return CarImage.objects.create(car=self.car, image='car_images/photo.jpg', **kwargs)
+
+    def image_updates(self, queries):
+        return [query['sql'] for query in queries if query['sql'].startswith('UPDATE "main_dealer_carimage"')]
+
+    def test_promoting_an_image_demotes_the_previous_main_image(self):
+        first = self.add_image(is_main=True)
+        second = self.add_image()
+
+        second.is_main = True
+        second.save()
+
+        first.refresh_from_db()
+        self.assertFalse(first.is_main)
+        self.assertEqual(list(self.car.images.filter(is_main=True)), [second])
+
+    def test_adding_a_main_image_demotes_the_previous_main_image(self):
+        first = self.add_image(is_main=True)
+        second = self.add_image(is_main=True)
+
+        self.assertEqual(list(self.car.images.filter(is_main=True)), [second])
+        first.refresh_from_db()
+        self.assertFalse(first.is_main)
+
+    def test_editing_a_non_main_image_issues_no_demotion_update(self):
+        main = self.add_image(is_main=True)
+        image = self.add_image()
+
+        image.alt_text = 'Side view'
+        with CaptureQueriesContext(connection) as queries:
+            image.save()
+
+        self.assertEqual(len(self.image_updates(queries)), 1)
+        main.refresh_from_db()
+        self.assertTrue(main.is_main)
+
+    def test_resaving_the_main_image_issues_no_demotion_update(self):
+        main = self.add_image(is_main=True)
+
+        main.alt_text = 'Front view'
+        with CaptureQueriesContext(connection) as queries:
+            main.save()
+
+        self.assertEqual(len(self.image_updates(queries)), 1)
+        main.refresh_from_db()
+        self.assertTrue(main.is_main)
+
+    def test_main_images_of_other_cars_are_untouched(self):
+        other_main = CarImage.objects.create(car=create_car('KK002'), image='car_images/other.jpg', is_main=True)
+
+        self.add_image(is_main=True)
+
+        other_main.refresh_from_db()
+        self.assertTrue(other_main.is_main)
+
+
+class CarMainImageTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.car = create_car()
+        cls.first = CarImage.objects.create(car=cls.car, image='car_images/first.jpg', order=0)
+        cls.second = CarImage.objects.create(car=cls.car, image='car_images/second.jpg', order=1)
+
+    def test_prefers_the_main_image_over_the_first(self):
+        CarImage.objects.filter(pk=self.second.pk).update(is_main=True)
+        car = Car.objects.prefetch_related(*main_image_prefetches()).get(pk=self.car.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(car.main_image, self.second)
+
+    def test_falls_back_to_the_first_image(self):
+        car = Car.objects.prefetch_related(*main_image_prefetches()).get(pk=self.car.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(car.main_image, self.first)
+
+    def test_main_images_prefetched_alone_fall_back_to_a_query(self):
+        car = Car.objects.prefetch_related(
+            Prefetch('images', queryset=CarImage.objects.filter(is_main=True), to_attr='_main_images')
+        ).get(pk=self.car.pk)
+
+        self.assertEqual(car.main_image, self.first)
+
+
+class CappedPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(5):
+            create_car(f'KK{number:03}')
+
+    def paginator(self, max_count):
+        paginator = CappedPaginator(Car.objects.all(), 2)
+        paginator.max_count = max_count
+        return paginator
+
+    def test_counts_every_row_under_the_cap(self):
+        paginator = self.paginator(max_count=10)
+
+        self.assertEqual(paginator.count, 5)
+        self.assertFalse(paginator.count_is_capped)
+        self.assertEqual(paginator.num_pages, 3)
+
+    def test_count_stops_at_the_cap(self):
+        paginator = self.paginator(max_count=3)
+
+        self.assertEqual(paginator.count, 3)
+        self.assertTrue(paginator.count_is_capped)
+        self.assertEqual(paginator.num_pages, 2)
+
+    def test_a_result_set_exactly_at_the_cap_is_not_capped(self):
+        paginator = self.paginator(max_count=5)
+
+        self.assertEqual(paginator.count, 5)
+        self.assertFalse(paginator.count_is_capped)
+
+
+class CacheInvalidationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.car = create_car()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_saving_a_car_moves_the_listing_to_a_new_version(self):
+        version = get_car_list_version()
+
+        self.car.selling_price = 4500000
+        self.car.save()
+
+        self.assertNotEqual(get_car_list_version(), version)
+
+    def test_adding_a_car_image_moves_the_listing_to_a_new_version(self):
+        version = get_car_list_version()
+
+        CarImage.objects.create(car=self.car, image='car_images/photo.jpg')
+
+        self.assertNotEqual(get_car_list_version(), version)
+
+    def test_saving_a_car_refreshes_the_filter_options(self):
+        self.assertEqual(get_filter_options()['colors'], ('Black',))
+
+        self.car.color = 'White'
+        self.car.save()
+
+        self.assertEqual(get_filter_options()['colors'], ('White',))
+
+    def test_renaming_a_brand_refreshes_brand_and_car_choices(self):
+        get_cached_brand_choices()
+        get_cached_available_car_choices()
+
+        brand = self.car.brand
+        brand.name = 'Lexus'
+        brand.save()
+
+        self.assertEqual(get_cached_brand_choices(), [(brand.pk, 'Lexus')])
+        self.assertEqual(get_cached_available_car_choices(), [(self.car.pk, '2020 Lexus Prado')])
+
+    def test_renaming_a_car_model_refreshes_the_models_by_brand_payload(self):
+        car_model = self.car.car_model
+        self.assertIn('Prado', get_cached_models_by_brand()[str(car_model.brand_id)][1])
+
+        car_model.name = 'Land Cruiser'
+        car_model.save()
+
+        self.assertIn('Land Cruiser', get_cached_models_by_brand()[str(car_model.brand_id)][1])
+
+
+class AdminChangelistTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def search(self, url, term):
+        response = self.client.get(url, {'q': term})
+        self.assertEqual(response.status_code, 200)
+        return list(response.context['cl'].result_list)
+
+
+class CustomerAdminSearchTests(AdminChangelistTestCase):
+    url = '/admin/main_dealer/customer/'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.customer = Customer.objects.create(
+            first_name='Wanjiku', last_name='Kamau', email='wanjiku@example.com', phone='+254700000001',
+            id_number='12345678',
+        )
+        Customer.objects.create(first_name='Otieno', last_name='Odhiambo', email='otieno@example.com', phone='+254700000002')
+
+    def test_changelist_renders_the_search_box(self):
+        response = self.client.get(self.url)
+
+        self.assertContains(response, 'id="searchbar"')
+
+    def test_search_matches_exact_email_phone_and_id_number(self):
+        for term in ['wanjiku@example.com', '+254700000001', '12345678']:
+            with self.subTest(term=term):
+                self.assertEqual(self.search(self.url, term), [self.customer])
+
+    def test_search_matches_first_and_last_names_in_any_case(self):
+        for term in ['Wanjiku', 'kamau', 'WANJIKU KAMAU']:
+            with self.subTest(term=term):
+                self.assertEqual(self.search(self.url, term), [self.customer])
+
+    def test_search_does_not_match_partial_values(self):
+        self.assertEqual(self.search(self.url, 'wanjiku@'), [])
+
+
+class CarAdminSearchTests(AdminChangelistTestCase):
+    url = '/admin/main_dealer/car/'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.car = create_car('KK001')
+        Car.objects.filter(pk=cls.car.pk).update(vin_number='JTEBU3FJ10K123456')
+        other = create_car('KK002')
+        Car.objects.filter(pk=other.pk).update(color='White')
+
+    def test_changelist_renders_the_search_box(self):
+        response = self.client.get(self.url)
+
+        self.assertContains(response, 'id="searchbar"')
+
+    def test_search_matches_exact_stock_number_and_vin(self):
+        for term in ['KK001', 'JTEBU3FJ10K123456']:
+            with self.subTest(term=term):
+                self.assertEqual(self.search(self.url, term), [self.car])
+
+    def test_search_matches_whole_color_names_in_any_case(self):
+        self.assertEqual(self.search(self.url, 'black'), [self.car])
+        self.assertEqual(self.search(self.url, 'bla'), [])
+
+
+class TransactionAdminChangelistTests(AdminChangelistTestCase):
+    urls = [
+        '/admin/main_dealer/inquiry/',
+        '/admin/main_dealer/rental/',
+        '/admin/main_dealer/sale/',
+        '/admin/main_dealer/testdrive/',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        now = timezone.now()
+        for number in range(3):
+            car = create_car(f'KK{number:03}')
+            customer = Customer.objects.create(
+                first_name='Wanjiku', last_name='Kamau', email=f'customer{number}@example.com', phone='+254700000001',
+            )
+            Inquiry.objects.create(car=car, customer=customer, inquiry_type='general', message='Is it available?')
+            Rental.objects.create(
+                car=car, customer=customer, start_date=now, end_date=now, pickup_location='Showroom',
+                return_location='Showroom', daily_rate=5000, total_days=1, subtotal=5000, security_deposit=0,
+                total_amount=5000,
+            )
+            Sale.objects.create(car=car, customer=customer, agreed_price=5000000, final_amount=5000000, payment_method='cash')
+            TestDrive.objects.create(car=car, customer=customer, scheduled_date=now)
+
+    def test_changelists_render_with_car_labels(self):
+        for url in self.urls:
+            for params in [{}, {'q': 'KK001'}, {'o': '2'}]:
+                with self.subTest(url=url, params=params):
+                    response = self.client.get(url, params)
+                    self.assertContains(response, 'Toyota Prado')
+
+    def test_inquiry_changelist_links_to_the_car(self):
+        car = Car.objects.get(stock_number='KK001')
+
+        response = self.client.get(self.urls[0])
+
+        self.assertContains(response, f'/admin/main_dealer/car/{car.pk}/change/')
@@ -0,0 +1,41 @@
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+
+def make_thumbnail(image_file, size):
+    """Return a WebP copy of ``image_file`` scaled down to fit within ``size``.
+
+    The source is rewound afterwards so an upload that has not been committed
+    yet can still be written to storage by the model save that follows.
+    """
+    image_file.open()
+    with Image.open(image_file) as image:
+        thumbnail = ImageOps.exif_transpose(image)
+        thumbnail.thumbnail(size)
+        if thumbnail.mode not in ('RGB', 'RGBA'):
+            thumbnail = thumbnail.convert('RGBA')
+        buffer = BytesIO()
+        thumbnail.save(buffer, format='WEBP', quality=80)
+    image_file.seek(0)
+
+    name = os.path.splitext(os.path.basename(image_file.name))[0]
+    return ContentFile(buffer.getvalue(), name=f"{name}_{size[0]}x{size[1]}.webp")
+
+
+def make_upload_thumbnail(image_file, size):
+    """``make_thumbnail`` for a model save, or None if the file can't be read.
+
+    A thumbnail is only a cache of the original, so a missing or corrupt file
+    is logged instead of failing the save that uploaded it.
+    """
+    try:
+        return make_thumbnail(image_file, size)
+    except (OSError, UnidentifiedImageError):
+        logger.warning("Could not generate a %sx%s copy of %s", size[0], size[1], image_file.name, exc_info=True)
+        return None
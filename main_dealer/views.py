@@ -1,54 +1,110 @@
 # views.py
-from django.shortcuts import render, get_object_or_404
-from django.db.models import Q, Count, Min, Max
-from django.core.paginator import Paginator
-from django.http import JsonResponse
+from itertools import chain
+from operator import attrgetter
+
+from django.shortcuts import render, redirect, get_object_or_404
+from django.db import connection
+from django.db.models import Q, Count, prefetch_related_objects
+from django.http import HttpResponse
+from django.templatetags.static import static
 from django.contrib import messages
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
 from django.views.generic import ListView, DetailView
 from .models import (
-    Car, Brand, CarModel, Category, Feature, 
-    Customer, Inquiry, BlogPost, RentalRate
+    Car, Brand, CarModel, Feature, 
+    Customer, Inquiry, BlogPost, RentalRate, main_image_prefetches
 )
 from .forms import InquiryForm, TestDriveForm, ContactForm
+from .pagination import CappedPaginator
+from .caching import (
+    CAR_LIST_PAGE_TIMEOUT, EMPTY_MODELS_PAYLOAD, get_cached_models_by_brand, get_car_list_version,
+    get_filter_options,
+)
+
+
+# Car listing GET parameters and the lookups they filter on
+CAR_LIST_FILTERS = {
+    'brand': 'brand_id',
+    'model': 'car_model_id',
+    'year': 'year',
+    'car_type': 'car_type',
+    'condition': 'condition',
+    'transmission': 'transmission',
+    'fuel_type': 'fuel_type',
+    'color': 'color__icontains',
+    'min_price': 'selling_price__gte',
+    'max_price': 'selling_price__lte',
+}
+
+MILEAGE_LIMITS = {
+    '10': 10000,
+    '15': 15000,
+    '20': 20000,
+    '25': 25000,
+    '27': 27000,
+}
 
+AVAILABILITY_FILTERS = {
+    'sale': {'is_for_sale': True},
+    'rent': {'is_for_rent': True},
+}
 
+CAR_LIST_SORTS = frozenset([
+    'selling_price', '-selling_price',
+    'year', '-year',
+    'mileage', '-mileage',
+    'created_at', '-created_at',
+])
+
+# per_page GET values and the page sizes they select
+PER_PAGE_OPTIONS = {'9': 9, '15': 15, '20': 20}
+
+# Columns rendered by the home page and listing cards; long text columns such as
+# description stay unloaded
+CAR_CARD_FIELDS = [
+    'id', 'slug', 'title', 'display_name', 'year', 'car_type', 'mileage', 'horsepower',
+    'transmission', 'fuel_type', 'selling_price', 'dealer_discount', 'final_price',
+    'monthly_rent_estimate', 'status', 'is_featured', 'is_for_sale', 'is_for_rent',
+    'brand__name', 'brand__slug', 'car_model__name',
+]
+
+
+@cache_page(60 * 5)
+@vary_on_cookie
 def home_view(request):
     """Home page view with featured cars and services"""
     
+    available_cars = Car.objects.filter(status='available').select_related(
+        'brand', 'car_model'
+    ).only(*CAR_CARD_FIELDS)
+    
     # Get featured cars for the hero section
-    featured_cars = Car.objects.filter(
-        is_featured=True, 
-        status='available'
-    ).select_related('brand', 'car_model').prefetch_related('images')[:8]
+    featured_cars = list(available_cars.filter(is_featured=True)[:8])
     
     # Get latest cars
-    latest_cars = Car.objects.filter(
-        status='available'
-    ).select_related('brand', 'car_model').prefetch_related('images').order_by('-created_at')[:8]
+    latest_cars = list(available_cars.order_by('-created_at')[:8])
     
     # Get cars for sale
-    cars_for_sale = Car.objects.filter(
-        is_for_sale=True,
-        status='available'
-    ).select_related('brand', 'car_model').prefetch_related('images')[:4]
+    cars_for_sale = list(available_cars.filter(is_for_sale=True)[:4])
     
     # Get cars for rent
-    cars_for_rent = Car.objects.filter(
-        is_for_rent=True,
-        status='available'
-    ).select_related('brand', 'car_model').prefetch_related('images')[:4]
+    cars_for_rent = list(available_cars.filter(is_for_rent=True)[:4])
+    
+    # Load main images for every car on the page at once rather than per section and per card
+    prefetch_related_objects(
+        featured_cars + latest_cars + cars_for_sale + cars_for_rent,
+        *main_image_prefetches()
+    )
     
     # Get latest blog posts
-    blog_posts = BlogPost.objects.filter(is_published=True)[:3]
+    blog_posts = BlogPost.objects.filter(is_published=True).select_related('author')[:3]
     
-    # Get brands for the filter
-    brands = Brand.objects.filter(is_active=True).order_by('name')
-    
-    # Get year range for filter
-    year_range = Car.objects.aggregate(
-        min_year=Min('year'),
-        max_year=Max('year')
-    )
+    # Brands and year range for the filter come from the cached listing options
+    filter_options = get_filter_options()
+    brands = filter_options['brands']
+    year_range = filter_options['year_range']
     
     context = {
         'featured_cars': featured_cars,
@@ -62,138 +118,85 @@ def home_view(request):
         'meta_description': 'Browse our extensive collection of new and used cars. Foreign imports, local vehicles, and rental options available.',
     }
     
-    return render(request, 'home.html', context)
+    response = render(request, 'home.html', context)
+    # The hero background is set in an inline style, which browsers only find
+    # late; preloading it starts the largest above-the-fold download early
+    response['Link'] = f'<{static("img/hero-bg.jpg")}>; rel=preload; as=image'
+    return response
 
 
 def car_list_view(request):
     """Car listing page with filters and pagination"""
-    
-    # Base queryset
-    cars = Car.objects.filter(status='available').select_related(
-        'brand', 'car_model', 'car_model__category'
-    ).prefetch_related('images', 'rental_rates')
-    
-    # Apply filters
-    brand_id = request.GET.get('brand')
-    if brand_id:
-        cars = cars.filter(brand_id=brand_id)
-    
-    model_id = request.GET.get('model')
-    if model_id:
-        cars = cars.filter(car_model_id=model_id)
-    
-    year = request.GET.get('year')
-    if year:
-        cars = cars.filter(year=year)
-    
-    car_type = request.GET.get('car_type')
-    if car_type:
-        cars = cars.filter(car_type=car_type)
-    
-    condition = request.GET.get('condition')
-    if condition:
-        cars = cars.filter(condition=condition)
-    
-    transmission = request.GET.get('transmission')
-    if transmission:
-        cars = cars.filter(transmission=transmission)
-    
-    fuel_type = request.GET.get('fuel_type')
-    if fuel_type:
-        cars = cars.filter(fuel_type=fuel_type)
-    
-    color = request.GET.get('color')
-    if color:
-        cars = cars.filter(color__icontains=color)
-    
-    # Price range filter
-    min_price = request.GET.get('min_price')
-    max_price = request.GET.get('max_price')
-    if min_price:
-        cars = cars.filter(selling_price__gte=min_price)
-    if max_price:
-        cars = cars.filter(selling_price__lte=max_price)
+    # Pages are cached per querystring under the current listing version, which
+    # inventory changes bump so stale pages are never served
+    key_prefix = f'car_list:{get_car_list_version()}'
+    return cache_page(CAR_LIST_PAGE_TIMEOUT, key_prefix=key_prefix)(render_car_list)(request)
+
+
+@vary_on_cookie
+def render_car_list(request):
+    # Collect every filter first so the queryset is built with a single filter() call
+    filters = {'status': 'available'}
+    for param, lookup in CAR_LIST_FILTERS.items():
+        value = request.GET.get(param)
+        if value:
+            filters[lookup] = value
     
     # Mileage filter
     mileage = request.GET.get('mileage')
-    if mileage:
-        mileage_map = {
-            '10': 10000,
-            '15': 15000,
-            '20': 20000,
-            '25': 25000,
-            '27': 27000,
-        }
-        if mileage in mileage_map:
-            cars = cars.filter(mileage__lte=mileage_map[mileage])
+    if mileage in MILEAGE_LIMITS:
+        filters['mileage__lte'] = MILEAGE_LIMITS[mileage]
     
     # Availability filter
-    availability = request.GET.get('availability', 'all')
-    if availability == 'sale':
-        cars = cars.filter(is_for_sale=True)
-    elif availability == 'rent':
-        cars = cars.filter(is_for_rent=True)
+    filters.update(AVAILABILITY_FILTERS.get(request.GET.get('availability'), {}))
+    
+    cars = Car.objects.filter(**filters).select_related(
+        'brand', 'car_model'
+    ).only(*CAR_CARD_FIELDS).prefetch_related('images', 'rental_rates')
     
     # Search functionality
     search = request.GET.get('search')
     if search:
+        if connection.vendor == 'postgresql':
+            # Matched through the GIN indexes created in migration 0007
+            from django.contrib.postgres.search import SearchQuery, SearchVector
+            query = SearchQuery(search, config='english')
+            cars = cars.alias(
+                title_document=SearchVector('title', config='english'),
+                description_document=SearchVector('description', config='english'),
+            )
+            text_match = Q(title_document=query) | Q(description_document=query)
+        else:
+            text_match = Q(title__icontains=search) | Q(description__icontains=search)
+        # Brand and model names are matched against their own small tables
         cars = cars.filter(
-            Q(brand__name__icontains=search) |
-            Q(car_model__name__icontains=search) |
-            Q(title__icontains=search) |
-            Q(description__icontains=search)
+            Q(brand__in=Brand.objects.filter(name__icontains=search)) |
+            Q(car_model__in=CarModel.objects.filter(name__icontains=search)) |
+            text_match
         )
     
     # Sorting
     sort_by = request.GET.get('sort', '-created_at')
-    valid_sorts = [
-        'selling_price', '-selling_price',
-        'year', '-year',
-        'mileage', '-mileage',
-        'created_at', '-created_at'
-    ]
-    if sort_by in valid_sorts:
+    if sort_by in CAR_LIST_SORTS:
         cars = cars.order_by(sort_by)
     
     # Pagination
-    per_page = request.GET.get('per_page', 9)
-    try:
-        per_page = int(per_page)
-        if per_page not in [9, 15, 20]:
-            per_page = 9
-    except (ValueError, TypeError):
-        per_page = 9
-    
-    paginator = Paginator(cars, per_page)
+    per_page = PER_PAGE_OPTIONS.get(request.GET.get('per_page'), 9)
+    
+    paginator = CappedPaginator(cars, per_page)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Get filter options
-    brands = Brand.objects.filter(is_active=True).order_by('name')
-    models = CarModel.objects.filter(is_active=True).select_related('brand').order_by('brand__name', 'name')
-    categories = Category.objects.all().order_by('name')
-    
-    # Get available years, colors, etc.
-    years = Car.objects.values_list('year', flat=True).distinct().order_by('-year')
-    colors = Car.objects.values_list('color', flat=True).distinct().order_by('color')
-    
-    # Price range
-    price_range = Car.objects.aggregate(
-        min_price=Min('selling_price'),
-        max_price=Max('selling_price')
-    )
+    # Filter options are shared by every listing request
+    filter_options = get_filter_options()
     
     context = {
         'page_obj': page_obj,
         'cars': page_obj,
-        'brands': brands,
-        'models': models,
-        'categories': categories,
-        'years': years,
-        'colors': colors,
-        'price_range': price_range,
+        **filter_options,
         'current_filters': request.GET,
         'total_cars': paginator.count,
+        'total_cars_capped': paginator.count_is_capped,
         'page_title': 'Car Listing - Kai and Karo',
         'meta_description': 'Browse our complete inventory of cars for sale and rent.',
     }
@@ -211,11 +214,20 @@ def car_detail_view(request, slug):
         slug=slug
     )
     
-    # Get related cars (same brand or model)
-    related_cars = Car.objects.filter(
-        Q(brand=car.brand) | Q(car_model=car.car_model),
-        status='available'
-    ).exclude(id=car.id).select_related('brand', 'car_model').prefetch_related('images')[:4]
+    # Get related cars (same brand or model). Each side is a LIMIT 4 index scan
+    # and the newest four of both are kept, instead of one OR over the table
+    other_cars = Car.objects.filter(status='available').exclude(id=car.id).select_related(
+        'brand', 'car_model'
+    ).order_by('-created_at')
+    candidates = {
+        related.pk: related
+        for related in chain(
+            other_cars.filter(brand_id=car.brand_id)[:4],
+            other_cars.filter(car_model_id=car.car_model_id)[:4],
+        )
+    }
+    related_cars = sorted(candidates.values(), key=attrgetter('created_at'), reverse=True)[:4]
+    prefetch_related_objects(related_cars, 'images')
     
     # Handle inquiry form
     inquiry_form = InquiryForm()
@@ -223,36 +235,25 @@ def car_detail_view(request, slug):
     
     if request.method == 'POST':
         if 'inquiry_submit' in request.POST:
-            inquiry_form = InquiryForm(request.POST)
+            inquiry_form = InquiryForm(request.POST, car=car)
             if inquiry_form.is_valid():
-                inquiry = inquiry_form.save(commit=False)
-                inquiry.car = car
-                inquiry.save()
+                inquiry_form.save()
                 messages.success(request, 'Your inquiry has been submitted successfully!')
                 return redirect('car_detail', slug=car.slug)
         
         elif 'test_drive_submit' in request.POST:
-            test_drive_form = TestDriveForm(request.POST)
+            test_drive_form = TestDriveForm(request.POST, car=car)
             if test_drive_form.is_valid():
-                test_drive = test_drive_form.save(commit=False)
-                test_drive.car = car
-                test_drive.save()
+                test_drive_form.save()
                 messages.success(request, 'Your test drive has been scheduled!')
                 return redirect('car_detail', slug=car.slug)
     
-    # Get features by category
-    features_by_category = {}
-    for feature in car.features.all():
-        if feature.category not in features_by_category:
-            features_by_category[feature.category] = []
-        features_by_category[feature.category].append(feature)
-    
     context = {
         'car': car,
         'related_cars': related_cars,
         'inquiry_form': inquiry_form,
         'test_drive_form': test_drive_form,
-        'features_by_category': features_by_category,
+        'features_by_category': car.features_by_category,
         'page_title': f"{car.title} - Kai and Karo",
         'meta_description': car.meta_description or car.description[:160],
     }
@@ -260,19 +261,15 @@ def car_detail_view(request, slug):
     return render(request, 'cars/car_detail.html', context)
 
 
+def models_by_brand_payload(request):
+    """Cached ``(etag, body)`` for the brand in the request's query string"""
+    return get_cached_models_by_brand().get(request.GET.get('brand_id', ''), EMPTY_MODELS_PAYLOAD)
+
+
+@condition(etag_func=lambda request: models_by_brand_payload(request)[0])
 def get_models_by_brand(request):
     """AJAX view to get models by brand"""
-    brand_id = request.GET.get('brand_id')
-    models = []
-    
-    if brand_id:
-        models = list(
-            CarModel.objects.filter(brand_id=brand_id, is_active=True)
-            .values('id', 'name')
-            .order_by('name')
-        )
-    
-    return JsonResponse({'models': models})
+    return HttpResponse(models_by_brand_payload(request)[1], content_type='application/json')
 
 
 def contact_view(request):
@@ -296,6 +293,8 @@ def contact_view(request):
     return render(request, 'cars/contact.html', context)
 
 
+@cache_page(60 * 60)
+@vary_on_cookie
 def about_view(request):
     """About page view"""
     context = {